@@ -3,4 +3,7 @@
 """
 from .builder import Builder
 
-__all__ = [Builder]
+# Former name of `Builder`, kept for backwards compatibility
+LayoutBuilder = Builder
+
+__all__ = ["Builder", "LayoutBuilder"]
@@ -1,8 +1,13 @@
 """Build layouts from HTML snippets."""
 import logging
-import re
+import sys
+import threading
+from functools import lru_cache
 from importlib import import_module
+from inspect import signature
 from os import PathLike
+from urllib.request import urlopen
+from weakref import WeakValueDictionary
 from typing import Optional, Type, Any, Union
 
 from dash.development.base_component import Component
@@ -12,6 +17,10 @@ from lxml.etree import _Element
 from .converters import evaluate
 
 logger = logging.getLogger("dash.htmlayout")
+# Prefix of attributes evaluated as Python literals
+_DATA_PREFIX = "data-"
+# Document structure tags added around the layout by the HTML parser
+_DOCUMENT_TAGS = frozenset({"html", "head", "body"})
 
 
 class Builder:
@@ -58,25 +67,36 @@ class Builder:
     _component_registry: dict[str, type] = {}
     # List of modules with already autodetected components
     _autodetected_modules: set = set()
-    # Components with id
-    _components: dict[str, Component] = {}
-    # Layout root component
-    layout: Optional[Component] = None
-
-    def __new__(cls, *args, file: Union[PathLike, str] = None, **kwargs) -> "Builder":
+    # Registered modules waiting for autodetection, in registration order
+    _pending_modules: list = list(_module_registry)
+    # Guards the registries when builders are created from several threads.
+    # Never held while importing libraries.
+    _registry_lock = threading.Lock()
+    # Components with id, set per instance. Only referenced weakly,
+    # so they are released along with the layout they belong to.
+    _components: WeakValueDictionary[str, Component]
+    # Layout root component, set per instance
+    layout: Optional[Component]
+
+    def __init__(self, file: Union[PathLike, str] = None):
         """
-        Instanciate a new LayoutBuilder object.
+        Instanciate a new Builder object.
+
+        Every new object will start an autodetection. Loaded layouts
+        are stored on the instance, so separate builders can load
+        documents concurrently.
 
-        Every new object will start an autodetection.
+        Args:
+            file: optional path or URL of an HTML document to load.
 
         See Also:
             `Builder.autodetect`
         """
-        instance = super().__new__(cls, *args, **kwargs)
-        cls._autodetect_components()
+        self._components = WeakValueDictionary()
+        self.layout = None
+        self._autodetect_components()
         if file is not None:
-            instance.load(file)
-        return instance
+            self.load(file)
 
     @classmethod
     def _autodetect_components(cls):
@@ -106,23 +126,37 @@ class Builder:
             first `Builder` object, and everytime you register a new library
             of components with `Builder.register_library`.
         """
-        for module_name, prefix in cls._module_registry.items():
+        with cls._registry_lock:
+            pending: list = [
+                (module_name, cls._module_registry[module_name])
+                for module_name in cls._pending_modules
+            ]
+            cls._pending_modules.clear()
+        # Import without holding the lock: the import lock of a module
+        # creating builders itself would otherwise deadlock with it
+        for module_name, prefix in pending:  # type: str, Optional[str]
             try:
-                if module_name not in cls._autodetected_modules:
-                    module = import_module(module_name)
-                    cls._autodetected_modules.add(module_name)
-                    for attribute in dir(module):
-                        symbol = getattr(module, attribute)
-                        if isinstance(symbol, type) and issubclass(symbol, Component):
-                            full_prefix: str = f"{prefix}-" if prefix else ""
-                            tag_name: str = f"{symbol.__name__.lower()}"
-                            full_name: str = f"{full_prefix}{tag_name}"
-                            cls._component_registry[full_name] = symbol
+                module = import_module(module_name)
             except ImportError:
                 logger.warning(
-                    f"Warning: {module_name} is listed in LayoutBuilder "
+                    f"Warning: {module_name} is listed in Builder "
                     f"registry but could not be imported."
                 )
+                continue
+            detected: dict[str, type] = {}
+            # Dash component libraries list their components in __all__
+            names = getattr(module, "__all__", None) or dir(module)
+            for attribute in names:
+                symbol = getattr(module, attribute, None)
+                if isinstance(symbol, type) and issubclass(symbol, Component):
+                    full_prefix: str = f"{prefix}-" if prefix else ""
+                    tag_name: str = f"{symbol.__name__.lower()}"
+                    full_name: str = f"{full_prefix}{tag_name}"
+                    detected[sys.intern(full_name)] = symbol
+            with cls._registry_lock:
+                cls._component_registry.update(detected)
+                cls._autodetected_modules.add(module_name)
+                cls._resolve_tag.cache_clear()
 
     @classmethod
     def register_library(
@@ -149,11 +183,14 @@ class Builder:
         <colorful-componentname id="component-id">...
         ```
         """
-        if path not in cls._module_registry or replace:
+        with cls._registry_lock:
+            if path in cls._module_registry and not replace:
+                return False
             cls._module_registry[path] = prefix
-            cls._autodetect_components()
-            return True
-        return False
+            if path not in cls._autodetected_modules and path not in cls._pending_modules:
+                cls._pending_modules.append(path)
+        cls._autodetect_components()
+        return True
 
     def load(self, path: Union[PathLike, str]) -> Component:
         """
@@ -162,13 +199,19 @@ class Builder:
         Returns:
             The root of the layout tree with all its descendants.
         """
-        parser = etree.XMLParser(
-            remove_comments=True, ns_clean=True, remove_pis=True,
-            resolve_entities=False, remove_blank_text=True)
-        root = etree.parse(path, parser=parser).getroot()
-        self._components = {}
-        if root:
-            self.layout = self._build_tree(root)
+        source = path
+        if "://" in str(path):
+            # `iterparse` only reads local files, fetch remote documents first
+            source = urlopen(str(path))
+        events = etree.iterparse(
+            source, events=("start", "end"), html=True, remove_comments=True,
+            remove_pis=True, remove_blank_text=True)
+        try:
+            self.layout, identified = self._build_tree(events)
+            self._components = WeakValueDictionary(identified)
+        finally:
+            if source is not path:
+                source.close()
         return self.layout
 
     def get_component(self, identifier: str) -> Optional[Component]:
@@ -185,36 +228,121 @@ class Builder:
         return self._components.get(identifier)
 
     @classmethod
-    def _to_component(cls, tag: str, **options) -> Optional[Component]:
-        """Build a component from an HTML tag, with options."""
-        component: Optional[Type[Component]] = cls._component_registry.get(
-            tag.lower(), None
-        )
-        if component is not None:
-            component: Component = component(**options)
+    @lru_cache(maxsize=512)
+    def _resolve_tag(cls, tag: str) -> Optional[Type[Component]]:
+        """
+        Get the component class matching an HTML tag.
+
+        Results are cached, and the cache is cleared every time
+        new components are registered.
+        """
+        registry = cls._component_registry
+        # Tags are usually lowercase already, avoid allocating a new string
+        component = registry.get(tag)
+        if component is None:
+            component = registry.get(tag.lower())
         return component
 
-    def _build_tree(self, element: _Element):
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _resolve_props(cls, factory: Type[Component]) -> dict[str, str]:
+        """
+        Get the mixed-case properties of a component class, by lowercase name.
+
+        The HTML parser lowercases attribute names, so properties like
+        `className` have to be restored before building the component.
         """
-        Build a layout recursively from an HTML element.
+        parameters = signature(factory.__init__).parameters
+        return {name.lower(): name for name in parameters if not name.islower()}
+
+    @classmethod
+    def _to_component(cls, tag: str, **options) -> Optional[Component]:
+        """Build a component from an HTML tag, with options."""
+        factory: Optional[Type[Component]] = cls._resolve_tag(tag)
+        if factory is None:
+            return None
+        props: dict[str, str] = cls._resolve_props(factory)
+        if props:
+            options = {props.get(key, key): value for key, value in options.items()}
+        return factory(**options)
+
+    def _build_tree(self, events: etree.iterparse) -> tuple:
+        """
+        Build a layout from a stream of parsing events.
+
+        Components are built when their closing tag is parsed, so their
+        children are always complete at that point, and are assigned
+        with a single `children` update per component. Parsed elements are
+        cleared right away, to keep memory usage constant while streaming.
+        The `html`, `head` and `body` tags added by the HTML parser are
+        skipped, and the single top-level element is the layout root.
 
         Returns:
-            A Dash component with children and attributes.
-        """
-        tag_name: str = element.tag
-        tag_text: str = (element.text or "").strip()
-        tag_children: list = list(filter(None, [tag_text]))
-        tag_attrs: dict = self._convert_data_attributes(element.attrib)
-        tag_id: Optional[str] = element.attrib.get("id")
-        component: Component = self._to_component(tag_name, **tag_attrs)
-        if tag_id is not None:
-            self._components[tag_id] = component
-        if hasattr(component, "children"):
-            component.children = tag_children
-            for child in element.getchildren():  # type: _Element
-                child_component: Component = self._build_tree(child)
-                component.children.append(child_component)
-        return component
+            The root Dash component with children and attributes, and
+            a dictionary of the components in the layout having an id.
+
+        Raises:
+            ValueError: if the document has more than one top-level element,
+                or text outside of it.
+        """
+        # Children of each open element, and its slot in `identified`
+        stack: list = []
+        # (id, component) pairs of the layout in document order, slots
+        # are reserved when elements open and filled when they close
+        identified: list = []
+        # Resolve methods once, they are called for every element
+        convert_attributes = self._convert_data_attributes
+        to_component = self._to_component
+        layout: Optional[Component] = None
+        # Whether the top-level element has been closed
+        closed: bool = False
+        try:
+            for event, element in events:  # type: str, _Element
+                tag_name: str = element.tag
+                if tag_name in _DOCUMENT_TAGS:
+                    if event == "end" and tag_name == "body":
+                        texts = [element.text, *(child.tail for child in element)]
+                        if any(text and text.strip() for text in texts):
+                            raise ValueError(
+                                "Found text outside of the root element, "
+                                "layouts must have a single top-level element."
+                            )
+                    continue
+                if event == "start":
+                    if closed:
+                        raise ValueError(
+                            f"Found <{tag_name}> after the root element, "
+                            f"layouts must have a single top-level element."
+                        )
+                    stack.append(([], len(identified)))
+                    identified.append(None)
+                    continue
+                children, mark = stack.pop()
+                tag_text: str = (element.text or "").strip()
+                attributes = element.attrib
+                tag_attrs: dict = convert_attributes(attributes)
+                tag_id: Optional[str] = attributes.get("id")
+                component: Component = to_component(tag_name, **tag_attrs)
+                if hasattr(component, "children"):
+                    component.children = [tag_text, *children] if tag_text else children
+                else:
+                    # Components without children ignore their descendants
+                    del identified[mark + 1:]
+                if tag_id is not None and component is not None:
+                    identified[mark] = (tag_id, component)
+                if not stack:
+                    layout, closed = component, True
+                    continue
+                stack[-1][0].append(component)
+                parent: _Element = element.getparent()
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+        except etree.XMLSyntaxError:
+            # Zero-byte documents have no element at all, like blank ones
+            if closed or stack:
+                raise
+        return layout, dict(filter(None, identified))
 
     @classmethod
     def _convert_data_attributes(cls, attributes: dict) -> dict:
@@ -228,18 +356,14 @@ class Builder:
             Dictionary of attributes with `data-*` attributes
             converted to Python objects.
         """
-        output: dict[str, Any] = dict(sorted(attributes.items()))
-        converted_keys: set = set()
-        generated_keys: dict = {}
-        for key in output:
-            key = key.lower()
+        kept: dict[str, str] = {}
+        generated: dict[str, Any] = {}
+        for key, value in attributes.items():
+            lower_key: str = key.lower()
             # Match keys named data-<name> and create a python object from that
-            matching = re.match(r"^(data-)(\w+)", key)
-            if matching:
-                new_key = matching.groups()[1]
-                generated_keys[new_key]: Any = evaluate(output[key])
-                converted_keys.add(key)
-        output.update(generated_keys)
-        for key in converted_keys:
-            del output[key]
-        return output
+            if lower_key.startswith(_DATA_PREFIX) and len(lower_key) > len(_DATA_PREFIX):
+                generated[lower_key[len(_DATA_PREFIX):]] = evaluate(value)
+            else:
+                kept[key] = value
+        # Evaluated attributes take precedence over plain ones
+        return {**kept, **generated}
@@ -1,35 +1,47 @@
+from copy import deepcopy
+from functools import lru_cache
 from typing import Any
 from ast import literal_eval
 
+# Literals common enough in attributes to be resolved without parsing
+_SCALAR_LITERALS: dict[str, Any] = {"True": True, "False": False, "None": None}
+# Characters allowed in a float literal handled by the fast path
+_FLOAT_CHARS: frozenset = frozenset("0123456789.eE+-")
 
-def evaluate(string: str) -> Any:
-    """
-    Evaluate a string in an HTML attribute to Python.
-
-    Args:
-        string: text passed as an attribute.
 
-    Returns:
-        A Python literal.
-    """
+@lru_cache(maxsize=1024)
+def _cached_literal(string: str) -> Any:
+    """Evaluate a Python literal, caching results for repeated strings."""
     return literal_eval(string)
 
 
-def evaluate_var(name: str) -> Any:
+def evaluate(string: str) -> Any:
     """
-    Get a local variable from its name.
+    Evaluate a string in an HTML attribute to Python.
 
     Args:
-        name: local variable name. Must start with "data_".
+        string: text passed as an attribute.
 
     Returns:
-        The content of the variable with the name passed as an argument.
-
-    Raises:
-        KeyError: when you give a non-existing name.
-        ValueError: if the variable name does not start with data_.
+        A Python literal. Mutable values are copied from the cache,
+        so they can be modified safely by the caller.
     """
-    if name.startswith("data_"):
-        return locals()[name]
-    else:
-        raise ValueError("Only var names starting with data_ are allowed.")
\ No newline at end of file
+    text: str = string.strip()
+    if text in _SCALAR_LITERALS:
+        return _SCALAR_LITERALS[text]
+    digits: str = text[1:] if text[:1] in ("+", "-") else text
+    if digits.isascii() and digits.isdigit():
+        # Leading zeros are only valid in Python literals for zero itself
+        if digits[0] != "0" or not digits.strip("0"):
+            return int(text)
+    elif text and _FLOAT_CHARS.issuperset(text):
+        try:
+            return float(text)
+        except ValueError:
+            pass
+    value: Any = _cached_literal(string)
+    try:
+        hash(value)
+    except TypeError:
+        return deepcopy(value)
+    return value
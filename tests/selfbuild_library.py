@@ -0,0 +1,10 @@
+"""Component library creating a builder while it is being imported."""
+from dash.development.base_component import Component
+
+from src.dash.htmlayout import Builder
+
+Builder()
+
+
+class Widget(Component):
+    """Component registered as <selfbuild-widget>."""
@@ -1,6 +1,7 @@
+import gc
+import threading
 import unittest
-
-from lxml.etree import XMLSyntaxError
+from concurrent.futures import ThreadPoolExecutor
 
 from src.dash.htmlayout import Builder
 
@@ -19,11 +20,124 @@ class BuilderTestCase(unittest.TestCase):
         self.assertIsNone(builder.get_component("invalid-dropdown"))
         self.assertIn("Red", dropdown.options)
 
+    def test_nested_file(self):
+        """Check that nested components keep their document order."""
+        builder = Builder(file="files/nested.html")
+        inner = builder.get_component("inner")
+        self.assertIs(builder.layout, builder.get_component("outer"))
+        self.assertEqual(builder.layout.children[0].children, ["Nested layout"])
+        self.assertIs(builder.layout.children[1], inner)
+        self.assertEqual(
+            [child.id for child in inner.children], ["first", "second"]
+        )
+        self.assertIsNotNone(builder.get_component("field"))
+        self.assertIsNone(builder.get_component("ignored"))
+
+    def test_released_components(self):
+        """Check that components are released along with their layout."""
+        builder = Builder(file="files/nested.html")
+        builder.layout = None
+        gc.collect()
+        self.assertIsNone(builder.get_component("first"))
+
+    def test_loose_file(self):
+        """Check that HTML documents do not need to be well-formed XML."""
+        builder = Builder(file="files/loose.html")
+        self.assertIs(builder.layout, builder.get_component("loose"))
+        self.assertEqual(builder.get_component("text").children, ["Unclosed paragraph"])
+
+    def test_camelcase_attributes(self):
+        """Check that mixed-case props survive the lowercasing HTML parser."""
+        builder = Builder(file="files/camelcase.html")
+        self.assertEqual(builder.get_component("wrapper").className, "wrapper")
+        dropdown = builder.get_component("colors")
+        self.assertEqual(dropdown.maxHeight, "40")
+        self.assertEqual(dropdown.optionHeight, 50)
+        self.assertIs(dropdown.clearable, False)
+
+    def test_duplicate_ids(self):
+        """Check that the last component in document order wins a duplicate id."""
+        builder = Builder(file="files/duplicate.html")
+        self.assertIs(builder.get_component("twice"), builder.layout.children[0])
+
+    def test_multiple_roots(self):
+        """Check that documents with several top-level elements are rejected."""
+        with self.assertRaises(ValueError):
+            Builder(file="files/multiple.html")
+
+    def test_trailing_text(self):
+        """Check that text after the root element is rejected."""
+        with self.assertRaises(ValueError):
+            Builder(file="files/trailing.html")
+
+    def test_text_only_file(self):
+        """Check that a document made of text only is rejected."""
+        with self.assertRaises(ValueError):
+            Builder(file="files/text.html")
+
+    def test_parallel_builds(self):
+        """Check that builders loading in parallel keep their own layout."""
+        files = ["files/simple.html", "files/nested.html"] * 4
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            builders = list(executor.map(lambda path: Builder(file=path), files))
+        for builder in builders[::2]:
+            self.assertIsNotNone(builder.get_component("color-dropdown"))
+            self.assertIsNone(builder.get_component("outer"))
+        for builder in builders[1::2]:
+            self.assertIsNotNone(builder.get_component("outer"))
+            self.assertIsNone(builder.get_component("color-dropdown"))
+
+    def test_reentrant_registration(self):
+        """Check that a library creating builders on import can be registered."""
+        self._restore_registries()
+        thread = threading.Thread(
+            target=Builder.register_library,
+            args=("tests.selfbuild_library", "selfbuild"),
+            daemon=True,
+        )
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNotNone(Builder._resolve_tag("selfbuild-widget"))
+
+    def _restore_registries(self):
+        """Restore the class-level registries of Builder after the test."""
+        registries = (
+            Builder._module_registry,
+            Builder._component_registry,
+            Builder._autodetected_modules,
+            Builder._pending_modules,
+        )
+        snapshots = [registry.copy() for registry in registries]
+
+        def restore():
+            for registry, snapshot in zip(registries, snapshots):
+                registry.clear()
+                if isinstance(registry, list):
+                    registry.extend(snapshot)
+                else:
+                    registry.update(snapshot)
+            Builder._resolve_tag.cache_clear()
+
+        self.addCleanup(restore)
+
+    def test_data_attributes(self):
+        """Check that data-* attributes are evaluated and take precedence."""
+        attributes = Builder._convert_data_attributes(
+            {"data-value": "3", "value": "2", "Data-Max": "10", "id": "slider"}
+        )
+        self.assertEqual(attributes, {"value": 3, "max": 10, "id": "slider"})
+        attributes = Builder._convert_data_attributes({"data-value": "3", "value": "2"})
+        self.assertEqual(attributes, {"value": 3})
+        attributes = Builder._convert_data_attributes({"value": "2", "data-value": "3"})
+        self.assertEqual(attributes, {"value": 3})
+
     def test_empty_file(self):
         """Check that the empty layout file creates no layout."""
-        with self.assertRaises(XMLSyntaxError) as e:
-            empty_builder = Builder(file="files/empty.html")
-            self.assertIsNone(empty_builder.layout)
+        empty_builder = Builder(file="files/empty.html")
+        self.assertIsNone(empty_builder.layout)
+        zero_builder = Builder(file="files/zero.html")
+        self.assertIsNone(zero_builder.layout)
 
 
 if __name__ == '__main__':
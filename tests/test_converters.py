@@ -0,0 +1,29 @@
+import unittest
+
+from src.dash.htmlayout.converters import evaluate
+
+
+class ConvertersTestCase(unittest.TestCase):
+
+    def test_evaluate_scalars(self):
+        """Check that common scalars match their Python literal."""
+        self.assertIs(evaluate("True"), True)
+        self.assertIsNone(evaluate("None"))
+        self.assertEqual(evaluate("-5"), -5)
+        self.assertEqual(evaluate("1e3"), 1000.0)
+        self.assertEqual(evaluate("1_000"), 1000)
+        self.assertEqual(evaluate("'Red'"), "Red")
+        self.assertEqual(evaluate("0"), 0)
+        self.assertIsInstance(evaluate("00"), int)
+        with self.assertRaises(SyntaxError):
+            evaluate("007")
+
+    def test_evaluate_mutable(self):
+        """Check that cached containers are not shared between calls."""
+        options = evaluate("['Red', 'Blue']")
+        options.append("Green")
+        self.assertEqual(evaluate("['Red', 'Blue']"), ["Red", "Blue"])
+
+
+if __name__ == '__main__':
+    unittest.main()